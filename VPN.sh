@@ -275,6 +275,89 @@ import_vpn_config() {
     return 0
 }
 
+# Function: Valida la sintassi della configurazione WireGuard (modalità CLI)
+# Come validate_wg_syntax, ma riporta gli errori su stderr invece che con dialog
+validate_wg_syntax_cli() {
+    local config_content="$1"
+    local errors=()
+
+    local cleaned_content=$(echo "$config_content" | grep -vE '^\s*#|^\s*$' | sed 's/^\s*//; s/\s*$//')
+
+    if ! echo "$cleaned_content" | grep -q '\[Interface\]'; then
+        errors+=("Manca la sezione '[Interface]'.")
+    fi
+
+    if echo "$cleaned_content" | grep -vE '^\s*\[[a-zA-Z0-9_]+\]$' | grep -q '\['; then
+        errors+=("Sezioni malformate trovate (es. '[[Sezione]' o '[Sezione').")
+    fi
+
+    local invalid_key_value_lines=$(echo "$cleaned_content" | grep -vE '^\s*\[[a-zA-Z0-9_]+\]$' | grep -vE '^\s*[a-zA-Z0-9_]+\s*=\s*.*$')
+
+    if [[ -n "$invalid_key_value_lines" ]]; then
+        errors+=("Righe con formato 'chiave = valore' non valido o chiavi non riconosciute.")
+    fi
+
+    if [[ ${#errors[@]} -eq 0 ]]; then
+        return 0
+    fi
+    echo "Sintassi della configurazione WireGuard NON valida:" >&2
+    for err in "${errors[@]}"; do
+        echo "  - $err" >&2
+    done
+    return 1
+}
+
+# Function: Importa una configurazione in modalità CLI (senza dialog)
+# Usata dalla GUI (VPNClientGUI.py) tramite 'VPN.sh import <file> <nome>'
+import_vpn_config_cli() {
+    local source_file="$1"
+    local output_basename="$2"
+
+    if [[ -z "$source_file" || -z "$output_basename" ]]; then
+        echo "Uso: $0 import <file_sorgente> <nome_configurazione>" >&2
+        return 1
+    fi
+    if [[ ! -f "$source_file" ]]; then
+        echo "Il file di configurazione '$source_file' non esiste." >&2
+        return 1
+    fi
+    if [[ "$output_basename" == *"/"* || "$output_basename" == *".."* ]]; then
+        echo "Nome non valido: '/' o '..' non sono consentiti." >&2
+        return 1
+    fi
+
+    local file_mime_type=$(file --mime-type -b "$source_file")
+    local config_content=""
+
+    if [[ "$file_mime_type" == image/* ]]; then
+        if ! command -v zbarimg &> /dev/null; then
+            echo "Il comando 'zbarimg' non è stato trovato (pacchetto 'zbar-tools')." >&2
+            return 1
+        fi
+        config_content=$(zbarimg --quiet --raw "$source_file")
+        if [[ -z "$config_content" ]]; then
+            echo "Nessun codice QR valido trovato nell'immagine o contenuto vuoto." >&2
+            return 1
+        fi
+    else
+        config_content=$(cat "$source_file")
+    fi
+
+    if ! validate_wg_syntax_cli "$config_content"; then
+        return 1
+    fi
+
+    local full_output_path="${WIREGUARD_CONFIG_DIR}/${output_basename}.conf"
+    mkdir -p "$WIREGUARD_CONFIG_DIR"
+    if ! echo "$config_content" | tee "$full_output_path" > /dev/null; then
+        echo "Errore durante il salvataggio della configurazione VPN in '$full_output_path'." >&2
+        return 1
+    fi
+    chmod 600 "$full_output_path"
+    echo "Configurazione VPN salvata con successo in '$full_output_path'."
+    return 0
+}
+
 # --- Root Permissions Check ---
 if [[ $EUID -ne 0 ]]; then
    # Use echo for this initial check since dialog might not be installed yet
@@ -283,6 +366,34 @@ if [[ $EUID -ne 0 ]]; then
    exit 1
 fi
 
+# --- Non-Interactive Mode (pkexec fallback of VPNClientGUI.py and the
+# 'import' verb of vpn_helperd.py) ---
+# When invoked with a verb the script performs a single operation and exits,
+# without requiring 'dialog'.  Read-only queries (interface listing, active
+# link) are answered by the GUI and the helper daemon directly, so only the
+# privileged verbs live here.
+if [[ $# -gt 0 ]]; then
+    case "$1" in
+        connect)
+            wg-quick up "$2"
+            exit $?
+            ;;
+        disconnect)
+            wg-quick down "$2"
+            exit $?
+            ;;
+        import)
+            import_vpn_config_cli "$2" "$3"
+            exit $?
+            ;;
+        *)
+            echo "Comando non riconosciuto: $1" >&2
+            echo "Uso: $0 [connect <nome>|disconnect <nome>|import <file> <nome>]" >&2
+            exit 1
+            ;;
+    esac
+fi
+
 # --- Main Script Logic ---
 
 # Check essential prerequisites
@@ -0,0 +1,743 @@
+#!/usr/bin/env python3
+
+# ==============================================================================
+# WireGuard VPN Management GUI
+# ==============================================================================
+#
+# This script provides a small Tkinter front-end for VPN.sh: it shows the
+# current WireGuard connection status and offers Connect / Disconnect /
+# Import actions, mirroring the 'dialog' TUI of VPN.sh for desktop use.
+#
+# Privileged operations ('connect', 'disconnect', 'import') are delegated to
+# a pkexec-started helper daemon (vpn_helperd.py, with a one-shot
+# pkexec+VPN.sh fallback; see the PolicyKit .policy file).  Read-only
+# queries are answered directly from the filesystem — /etc/wireguard for
+# the configured names, a /sys/class/net scan for the active link: they
+# run on every status refresh and on every Connect click, and going through
+# pkexec+bash for them would fork a privileged subprocess every few seconds
+# for information that requires no privileges at all.
+#
+# Prerequisites:
+# -   'python3-tk' package (Tkinter)
+# -   'wireguard-tools' package (for 'wg', 'wg-quick' commands)
+# -   'policykit-1' package (for 'pkexec')
+# -   'iproute2' package (for 'ip' command, usually pre-installed)
+#
+# Usage:
+#   ./VPNClientGUI.py
+#       (Normally launched via VPNClientGUI.desktop)
+# ==============================================================================
+
+import asyncio
+import json
+import os
+import re
+import socket
+import struct
+import subprocess
+import threading
+import time
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from tkinter import (filedialog, font as tkfont, messagebox, simpledialog,
+                     ttk)
+
+# Bound once at import instead of re-importing tkinter.messagebox inside
+# each dialog path; module lookup and Tcl proc registration happen before
+# the first error ever needs reporting.
+_show_info = messagebox.showinfo
+_show_error = messagebox.showerror
+
+# --- Configuration Variables ---
+# Directory for WireGuard configurations (one .conf file per interface)
+WIREGUARD_CONFIG_DIR = "/etc/wireguard"
+
+# Companion scripts living next to this file, resolved once at import
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+WIREGUARD_BASH_SCRIPT = os.path.join(SCRIPT_DIR, "VPN.sh")
+HELPER_SCRIPT = os.path.join(SCRIPT_DIR, "vpn_helperd.py")
+
+# Checked once instead of on every fallback invocation
+SCRIPT_AVAILABLE = os.access(WIREGUARD_BASH_SCRIPT, os.X_OK)
+
+# Acceptable configuration names: starts with a letter, digit or '_',
+# then letters, digits, '.', '_' or '-', 31 characters at most, never
+# two dots in a row (same rule as VPN.sh's import validation).  A single
+# anchored match replaces the old substring scans and rejects anything
+# that could misbehave as a filename (slashes, leading '-', whitespace).
+_NAME_RE = re.compile(r'\A(?!.*\.\.)[A-Za-z0-9_][A-Za-z0-9_.-]{0,30}\Z')
+
+# Unix socket of the long-lived privileged helper (vpn_helperd.py)
+HELPER_SOCKET = "/run/vpnclient.sock"
+
+# Opt-in startup authorization probe: set VPNCLIENT_PREWARM=1 to start
+# the helper (and its PolicyKit prompt) right after the window appears
+# instead of on the first privileged action.  Off by default so users
+# who only want to glance at the status never see a dialog.
+PREWARM_AUTH = os.environ.get("VPNCLIENT_PREWARM") == "1"
+
+# --- Netlink constants (linux/rtnetlink.h, linux/if_arp.h) ---
+RTMGRP_LINK = 1
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+ARPHRD_NONE = 0xFFFE  # hardware type reported by wireguard interfaces
+
+# Sentinel for "status never painted yet", so the first refresh always runs
+_UNSET = object()
+
+
+@dataclass(slots=True)
+class VpnApp:
+    """Widgets and runtime handles shared by the GUI callbacks.
+
+    Passed explicitly to the callbacks instead of living in module
+    globals: every status refresh touches these, and attribute access on
+    a slotted instance held in a local is a LOAD_FAST instead of a
+    LOAD_GLOBAL dict lookup — and keeps the wiring visible."""
+    root: tk.Tk
+    status_label: ttk.Label = None
+    disconnect_button: ttk.Button = None
+    netlink_socket: socket.socket = None
+    # asyncio loop driving subprocess work, run in a dedicated thread
+    loop: asyncio.AbstractEventLoop = None
+    # Bounded pool backing the loop's run_in_executor calls
+    executor: ThreadPoolExecutor = None
+    # Lazily-built Connect dialog, hidden and reshown instead of recreated
+    connect_window: tk.Toplevel = None
+    selected_vpn_name: tk.StringVar = None
+    vpn_combobox: ttk.Combobox = None
+    # Active interface currently shown in the label (None = disconnected)
+    shown_active: object = _UNSET
+    # Pending debounced status-refresh timer, if any
+    status_after_id: str = None
+
+
+# Serializes helper launches; _helper_proc tracks the one in flight
+_helper_lock = threading.Lock()
+_helper_proc = None
+
+# Set when the window closes so background waits give up promptly
+_shutting_down = threading.Event()
+
+
+def _helper_socket_alive():
+    """Probe the helper socket with a real connect.  A bare exists()
+    check is not enough: a SIGKILLed helper leaves the inode behind, and
+    a fresh launch (which unlinks and rebinds) would otherwise be blocked
+    until reboot."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(1)
+        sock.connect(HELPER_SOCKET)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def _helper_request_sync(command_args, timeout=10):
+    """Blocking counterpart of _helper_request_async for the rare
+    privileged fallbacks that run outside the asyncio loop.  Returns a
+    (success, output) tuple, or None if the helper is not reachable."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(HELPER_SOCKET)
+        sock.sendall(json.dumps({"cmd": command_args[0],
+                                 "args": command_args[1:]}).encode() + b"\n")
+        buf = b""
+        while not buf.endswith(b"\n"):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            buf += chunk
+        reply = json.loads(buf.decode())
+        return bool(reply.get("ok")), reply.get("output", "")
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+
+
+async def _helper_request_async(command_args):
+    """Submit one command to the privileged helper daemon as a JSON line.
+    Returns a (success, output) tuple, or None only when the request was
+    never delivered (connect refused: socket missing or stale).  Once the
+    request has been written the helper may be executing it, so a lost or
+    malformed reply is reported as a failure rather than None — falling
+    back to pkexec at that point would run the command a second time."""
+    try:
+        reader, writer = await asyncio.open_unix_connection(
+            HELPER_SOCKET, limit=MAX_CAPTURED_OUTPUT)
+    except OSError:
+        return None
+    try:
+        writer.write(json.dumps({"cmd": command_args[0],
+                                 "args": command_args[1:]}).encode() + b"\n")
+        await writer.drain()
+    except OSError:
+        writer.close()
+        return None
+    try:
+        line = await asyncio.wait_for(reader.readline(), timeout=120)
+        reply = json.loads(line.decode())
+        return bool(reply.get("ok")), reply.get("output", "")
+    except (OSError, ValueError, asyncio.TimeoutError):
+        return (False, "Nessuna risposta dall'helper; l'operazione "
+                       "potrebbe essere comunque in corso.")
+    finally:
+        writer.close()
+
+
+def start_helper_daemon():
+    """Launch vpn_helperd.py through pkexec and wait for its socket to
+    appear.
+
+    Callable any number of times per session: the daemon exits after its
+    idle timeout and unlinks the socket, so the guard is a probe connect
+    to the socket (accepting: nothing to do) plus the liveness of a
+    launch still in flight — not a one-shot flag that would leave every
+    later operation on the pkexec fallback forever."""
+    global _helper_proc
+    with _helper_lock:
+        if _helper_socket_alive():
+            return
+        if _helper_proc is not None and _helper_proc.poll() is None:
+            return  # a launch (or its PolicyKit dialog) is in flight
+        try:
+            # The script is executed directly (not via an interpreter
+            # argument) so it runs under its own .policy action, whose
+            # exec.path annotation pins the installed helper.
+            _helper_proc = subprocess.Popen(
+                ["pkexec", HELPER_SCRIPT, "--socket", HELPER_SOCKET],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError:
+            return
+        # Wait for the socket: the PolicyKit dialog may take a while.
+        # Aborts as soon as the GUI shuts down, so a dialog left open
+        # cannot keep the process alive after the window closes.
+        for _ in range(240):
+            if _helper_socket_alive() or _shutting_down.is_set():
+                return
+            if _helper_proc.poll() is not None:
+                return  # pkexec denied or the helper died
+            time.sleep(0.25)
+
+
+# Cap on captured subprocess output per stream (only the tail is kept)
+MAX_CAPTURED_OUTPUT = 16384
+
+
+async def _drain_stream(stream, tail):
+    """Read a subprocess stream incrementally, keeping only the last
+    MAX_CAPTURED_OUTPUT bytes.  An 'import' run over a large QR image can
+    be arbitrarily verbose; streaming the pipes caps the GUI's memory at a
+    few KiB per operation instead of buffering everything."""
+    while True:
+        chunk = await stream.read(4096)
+        if not chunk:
+            break
+        tail += chunk
+        if len(tail) > MAX_CAPTURED_OUTPUT:
+            del tail[:len(tail) - MAX_CAPTURED_OUTPUT]
+
+
+async def run_bash_command_async(command_args):
+    """Run a privileged VPN verb ('connect', 'disconnect', 'import') and
+    return a (success, output) tuple.
+
+    Prefers the long-lived helper daemon (a single sendmsg/recvmsg roundtrip
+    on its Unix socket); falls back to a one-shot pkexec+VPN.sh invocation
+    when the helper cannot be reached.  Runs on the asyncio loop, so the
+    fork/exec never blocks the Tk thread."""
+    reply = await _helper_request_async(command_args)
+    if reply is None:
+        # start_helper_daemon blocks on pkexec; keep the loop responsive.
+        await asyncio.get_running_loop().run_in_executor(
+            None, start_helper_daemon)
+        reply = await _helper_request_async(command_args)
+    if reply is not None:
+        return reply
+
+    if not SCRIPT_AVAILABLE:
+        return False, f"Script non trovato o non eseguibile: " \
+                      f"'{WIREGUARD_BASH_SCRIPT}'"
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "pkexec", WIREGUARD_BASH_SCRIPT, *command_args,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+    except OSError as exc:
+        return False, str(exc)
+    stdout_tail = bytearray()
+    stderr_tail = bytearray()
+    await asyncio.gather(_drain_stream(proc.stdout, stdout_tail),
+                         _drain_stream(proc.stderr, stderr_tail))
+    returncode = await proc.wait()
+    output = (stdout_tail.decode(errors="replace")
+              + stderr_tail.decode(errors="replace")).strip()
+    return returncode == 0, output
+
+
+def run_vpn_command(app, command_args, success_message, on_success=None):
+    """Submit a VPN verb to the asyncio loop from the Tk thread and report
+    the outcome back through root.after once it completes.  An optional
+    on_success callback runs on the Tk thread before the report."""
+    future = asyncio.run_coroutine_threadsafe(
+        run_bash_command_async(command_args), app.loop)
+
+    def on_done(fut):
+        try:
+            ok, output = fut.result()
+        except Exception as exc:  # loop died or coroutine raised
+            ok, output = False, str(exc)
+        if ok and on_success is not None:
+            app.root.after(0, on_success)
+        app.root.after(0, report_command_result, app, ok, output,
+                       success_message)
+
+    future.add_done_callback(on_done)
+
+
+def start_asyncio_loop():
+    """Start the asyncio loop that drives subprocess work in its own
+    daemon thread and return (loop, executor).
+
+    Blocking calls handed to run_in_executor (the pkexec helper launch,
+    the startup pre-warm) share one bounded two-thread pool instead of
+    the loop's default unbounded executor, so repeated actions reuse
+    threads rather than growing the pool.  The executor is returned so
+    shutdown_app can tear it down: its workers are non-daemon threads
+    and would otherwise be joined at interpreter exit."""
+    loop = asyncio.new_event_loop()
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="vpn-io")
+    loop.set_default_executor(executor)
+    threading.Thread(target=loop.run_forever, name="vpn-asyncio",
+                     daemon=True).start()
+    return loop, executor
+
+
+def shutdown_app(app):
+    """Close the window and tear down the background machinery so the
+    process exits promptly: signal background waits to give up, drop the
+    executor without joining its workers, stop the asyncio loop."""
+    _shutting_down.set()
+    app.executor.shutdown(wait=False, cancel_futures=True)
+    app.loop.call_soon_threadsafe(app.loop.stop)
+    app.root.destroy()
+
+
+# Cached interface tuple (sorted once on refresh), keyed on the config
+# directory's mtime
+_iface_cache = (0, ())
+
+
+def invalidate_interface_cache():
+    """Force the next get_vpn_interface_names call to re-read the
+    directory, and drop the status snapshot built on the old list so a
+    Connect click right after an import sees the new configuration."""
+    global _iface_cache, _status_cache
+    _iface_cache = (0, ())
+    _status_cache = (0.0, _status_cache[1])
+
+
+def _config_dir_readable():
+    """Whether /etc/wireguard can be listed without privileges.  Debian
+    and Ubuntu ship it 0700 root-owned, in which case the names must come
+    from the helper daemon."""
+    return os.access(WIREGUARD_CONFIG_DIR, os.R_OK | os.X_OK)
+
+
+def _list_interfaces_privileged():
+    """List the configurations through the root helper for systems where
+    /etc/wireguard is not readable by the desktop user.  Returns a sorted
+    tuple, or None if the helper is not reachable.  Deliberately never
+    launches the helper: this runs on every passive status refresh, and a
+    pkexec prompt must only ever follow a user action (see
+    launch_helper_from_action)."""
+    reply = _helper_request_sync(["list"])
+    if reply is None:
+        return None
+    ok, output = reply
+    if not ok:
+        return None
+    return tuple(sorted(output.split()))
+
+
+def get_vpn_interface_names():
+    """Return the sorted names of the configured WireGuard interfaces as a
+    tuple.
+
+    Reads /etc/wireguard directly when it is readable: listing the .conf
+    files then requires no privileges.  On systems where the directory is
+    root-only the names come from the helper daemon instead — pathlib's
+    glob would swallow the PermissionError and silently report an empty
+    system.  The result is cached keyed on the directory's mtime (stat
+    works regardless of read permission) — it only changes when a .conf
+    file is added or removed — so repeated Connect clicks cost one stat
+    call.  The tuple is sorted once when the cache refreshes and handed
+    out as-is: the hot path never re-sorts or copies, and the Combobox
+    takes it directly."""
+    global _iface_cache
+    try:
+        mtime = os.stat(WIREGUARD_CONFIG_DIR).st_mtime_ns
+    except OSError:
+        return ()
+    if mtime == _iface_cache[0]:
+        return _iface_cache[1]
+    if _config_dir_readable():
+        try:
+            names = tuple(sorted(
+                p.stem for p in Path(WIREGUARD_CONFIG_DIR).glob("*.conf")))
+        except OSError:
+            return ()
+    else:
+        names = _list_interfaces_privileged()
+        if names is None:
+            return ()  # not cached, so the next call retries
+    _iface_cache = (mtime, names)
+    return names
+
+
+def get_active_vpn_interface(configured=None):
+    """Return the name of the active WireGuard interface, or None.
+
+    A wg-quick interface exists in /sys/class/net exactly while it is up,
+    so detecting the active VPN is one directory scan intersected with
+    the configured names — a few syscalls, no subprocess at all.  An
+    already-known tuple of configured interfaces can be passed in to
+    avoid re-reading the config directory."""
+    if configured is None:
+        configured = get_vpn_interface_names()
+    configured = frozenset(configured)
+    if not configured:
+        return None
+    try:
+        with os.scandir("/sys/class/net") as entries:
+            for entry in entries:
+                if entry.name in configured:
+                    return entry.name
+    except OSError:
+        return None
+    return None
+
+
+# Cached (interfaces, active) snapshot with its monotonic timestamp
+_status_cache = (0.0, ((), None))
+
+# How long a status snapshot stays fresh, in seconds
+STATUS_CACHE_TTL = 0.5
+
+
+def get_vpn_status():
+    """Return an (interfaces, active) pair gathered in one pass.
+
+    Batches the interface listing and the active-link lookup so callers
+    that need both — a status refresh immediately followed by a Connect
+    click — share a single short-lived snapshot instead of issuing two
+    separate queries."""
+    global _status_cache
+    now = time.monotonic()
+    stamp, snapshot = _status_cache
+    if now - stamp < STATUS_CACHE_TTL:
+        return snapshot
+    interfaces = get_vpn_interface_names()
+    snapshot = (interfaces, get_active_vpn_interface(interfaces))
+    _status_cache = (now, snapshot)
+    return snapshot
+
+
+def update_status(app):
+    """Refresh the status label from the current link state.
+
+    Comparing against the last painted value lets unchanged refreshes
+    return without any Python→Tcl roundtrip."""
+    _, active = get_vpn_status()
+    if active == app.shown_active:
+        return
+    app.shown_active = active
+    if active:
+        app.status_label.config(text=f"Stato: CONNESSO a {active}",
+                                foreground="green")
+        app.disconnect_button.config(state=tk.NORMAL)
+    else:
+        app.status_label.config(text="Stato: DISCONNESSO", foreground="red")
+        app.disconnect_button.config(state=tk.DISABLED)
+
+
+def schedule_status_refresh(app, delay_ms=200):
+    """Coalesce bursts of refresh triggers into a single update_status.
+
+    A wg-quick run emits several netlink messages (link, addresses,
+    routes) and the command completion lands right behind them; cancelling
+    any pending timer before rearming turns the whole burst into one
+    refresh."""
+    if app.status_after_id is not None:
+        app.root.after_cancel(app.status_after_id)
+
+    def fire():
+        app.status_after_id = None
+        update_status(app)
+
+    app.status_after_id = app.root.after(delay_ms, fire)
+
+
+def open_netlink_socket():
+    """Subscribe to kernel RTNLGRP_LINK notifications so the GUI learns of
+    link changes as they happen.  Returns the bound socket, or None if
+    netlink is unavailable."""
+    try:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW,
+                             socket.NETLINK_ROUTE)
+        sock.bind((0, RTMGRP_LINK))
+        sock.setblocking(False)
+    except OSError:
+        return None
+    return sock
+
+
+def on_link_event(app):
+    """Handle RTM_NEWLINK/RTM_DELLINK notifications: drain the socket and
+    refresh the status only when a wireguard link appeared or disappeared."""
+    global _status_cache
+    wireguard_changed = False
+    while True:
+        try:
+            data = app.netlink_socket.recv(65535)
+        except BlockingIOError:
+            break
+        except OSError:
+            # Typically ENOBUFS: the kernel dropped notifications we never
+            # saw, possibly including a wireguard change.  Refresh rather
+            # than leave the label stale with no poll to catch up.
+            wireguard_changed = True
+            break
+        offset = 0
+        while offset + 20 <= len(data):
+            # struct nlmsghdr: u32 len, u16 type, u16 flags, u32 seq, u32 pid
+            msg_len, msg_type = struct.unpack_from("=IH", data, offset)
+            if msg_len < 16 or offset + msg_len > len(data):
+                break
+            if msg_type in (RTM_NEWLINK, RTM_DELLINK) and msg_len >= 20:
+                # struct ifinfomsg follows the header; ifi_type is at byte 2
+                ifi_type = struct.unpack_from("=H", data, offset + 18)[0]
+                if ifi_type == ARPHRD_NONE:
+                    wireguard_changed = True
+            offset += (msg_len + 3) & ~3
+    if wireguard_changed:
+        # The link state just changed: drop the snapshot before refreshing.
+        _status_cache = (0.0, _status_cache[1])
+        schedule_status_refresh(app)
+
+
+def report_command_result(app, ok, output, success_message):
+    """Show the outcome of a VPN.sh command and refresh the status.
+    Must be called from the Tk main thread (via root.after)."""
+    if ok:
+        _show_info("Successo", success_message)
+    else:
+        _show_error(
+            "Errore", f"Operazione fallita:\n\n{output or '(nessun output)'}")
+    schedule_status_refresh(app)
+
+
+def hide_connect_window(app):
+    """Hide the Connect dialog, keeping its widgets alive for reuse."""
+    app.connect_window.grab_release()
+    app.connect_window.withdraw()
+
+
+def do_connect(app):
+    """Connect the interface currently chosen in the Connect dialog."""
+    iface = app.selected_vpn_name.get()
+    hide_connect_window(app)
+    run_vpn_command(app, ["connect", iface],
+                    f"Interfaccia '{iface}' attivata con successo.")
+
+
+def build_connect_window(app):
+    """Create the Connect dialog once; later opens only repopulate it,
+    avoiding the Tcl widget-creation work on every click."""
+    app.connect_window = tk.Toplevel(app.root)
+    app.connect_window.title("Seleziona VPN da Connettere")
+    app.connect_window.resizable(False, False)
+    app.connect_window.transient(app.root)
+    app.connect_window.protocol("WM_DELETE_WINDOW",
+                                lambda: hide_connect_window(app))
+
+    ttk.Label(app.connect_window, text="Scegli un'interfaccia da attivare:",
+              font="vpn.body").pack(padx=10, pady=(10, 5))
+    app.selected_vpn_name = tk.StringVar()
+    app.vpn_combobox = ttk.Combobox(app.connect_window,
+                                    textvariable=app.selected_vpn_name,
+                                    state="readonly")
+    app.vpn_combobox.pack(padx=10, pady=5, fill=tk.X)
+
+    buttons = ttk.Frame(app.connect_window)
+    buttons.pack(padx=10, pady=(5, 10), fill=tk.X)
+    ttk.Button(buttons, text="Connetti",
+               command=lambda: do_connect(app)).pack(
+        side=tk.LEFT, expand=True, fill=tk.X, padx=(0, 5))
+    ttk.Button(buttons, text="Annulla",
+               command=lambda: hide_connect_window(app)).pack(
+        side=tk.LEFT, expand=True, fill=tk.X)
+
+    app.connect_window.withdraw()
+
+
+async def _launch_helper_async():
+    """Run the blocking helper launch on the executor."""
+    await asyncio.get_running_loop().run_in_executor(
+        None, start_helper_daemon)
+
+
+def launch_helper_from_action(app, on_ready):
+    """Start the privileged helper in response to a user action — the only
+    context allowed to surface a PolicyKit prompt — and run on_ready on
+    the Tk thread once the launch attempt finishes either way."""
+    future = asyncio.run_coroutine_threadsafe(_launch_helper_async(),
+                                              app.loop)
+    future.add_done_callback(lambda f: app.root.after(0, on_ready))
+
+
+def connect_vpn_gui(app, retried=False):
+    """Open the dialog listing the configured VPNs and connect the chosen
+    one.  The dialog is built on first use and reused afterwards."""
+    interfaces, _ = get_vpn_status()
+    if not interfaces:
+        if not retried and not _config_dir_readable():
+            # Root-only config dir and no helper answering yet: this is a
+            # click, so starting the helper (and its one PolicyKit
+            # prompt) is fine.  Retry exactly once when it is up; if the
+            # user dismissed the prompt the retry shows the info box.
+            launch_helper_from_action(
+                app, lambda: connect_vpn_gui(app, retried=True))
+            return
+        _show_info(
+            "Info",
+            f"Nessuna configurazione WireGuard trovata in "
+            f"'{WIREGUARD_CONFIG_DIR}'.\nImporta prima una configurazione.")
+        return
+
+    if app.connect_window is None:
+        build_connect_window(app)
+    app.vpn_combobox["values"] = interfaces
+    app.selected_vpn_name.set(interfaces[0])
+    app.connect_window.deiconify()
+    app.connect_window.grab_set()
+
+
+def disconnect_vpn_gui(app):
+    """Disconnect the currently active WireGuard interface (auto-detected)."""
+    _, active = get_vpn_status()
+    if not active:
+        _show_info(
+            "Info", "Nessuna interfaccia WireGuard attiva da disconnettere.")
+        return
+    run_vpn_command(app, ["disconnect", active],
+                    f"Interfaccia '{active}' disattivata con successo.")
+
+
+def import_config_gui(app):
+    """Import a new configuration from a QR code image or a text file."""
+    source_file = filedialog.askopenfilename(
+        title="Seleziona File Sorgente",
+        filetypes=[("Tutti i file", "*.*"),
+                   ("Immagini QR", "*.png *.jpg *.jpeg"),
+                   ("File di configurazione", "*.conf *.txt")])
+    if not source_file:
+        return
+
+    config_name = simpledialog.askstring(
+        "Nome Configurazione",
+        "Inserisci un nome per questa VPN (es. my_home_vpn):\n"
+        "(Questo sarà il nome del file .conf)",
+        parent=app.root)
+    if not config_name:
+        return
+
+    if not _NAME_RE.match(config_name):
+        _show_error(
+            "Errore",
+            "Nome non valido: usare solo lettere, numeri, '.', '_' o '-' "
+            "(massimo 31 caratteri, senza '.' o '-' iniziali né '..').")
+        return
+
+    run_vpn_command(app, ["import", source_file, config_name],
+                    f"Configurazione '{config_name}' importata con successo.",
+                    on_success=invalidate_interface_cache)
+
+
+def prewarm_privileges(app):
+    """Kick off the privileged helper right after the window appears.
+
+    The first pkexec of a session pays the PolicyKit dialog and D-Bus
+    roundtrip; doing it at startup (the helper's .policy action uses
+    auth_admin_keep) means the helper is already listening when the user
+    first clicks Connect, which then costs only a socket roundtrip.
+    Opt-in via VPNCLIENT_PREWARM=1, since it surfaces the dialog at
+    launch."""
+    app.loop.call_soon_threadsafe(
+        app.loop.run_in_executor, None, start_helper_daemon)
+
+
+def create_named_fonts():
+    """Register the named fonts once, right after the Tk interpreter comes
+    up.  Widgets reference them by name, so Tk parses and measures each
+    font a single time instead of once per font-tuple-bearing widget."""
+    tkfont.Font(name="vpn.title", family="Sans", size=12, weight="bold")
+    tkfont.Font(name="vpn.body", family="Sans", size=10)
+
+
+def create_main_window():
+    """Build the main window and enter the Tk main loop."""
+    app = VpnApp(root=tk.Tk())
+    app.loop, app.executor = start_asyncio_loop()
+    app.root.protocol("WM_DELETE_WINDOW", lambda: shutdown_app(app))
+
+    app.root.title("WireGuard VPN Manager")
+    app.root.resizable(False, False)
+    create_named_fonts()
+
+    frame = ttk.Frame(app.root, padding=15)
+    frame.pack(fill=tk.BOTH, expand=True)
+
+    app.status_label = ttk.Label(frame, text="Stato: ...", font="vpn.title")
+    app.status_label.pack(pady=(0, 10))
+
+    ttk.Button(frame, text="Connetti VPN",
+               command=lambda: connect_vpn_gui(app)).pack(fill=tk.X, pady=2)
+    app.disconnect_button = ttk.Button(
+        frame, text="Disconnetti VPN",
+        command=lambda: disconnect_vpn_gui(app))
+    app.disconnect_button.pack(fill=tk.X, pady=2)
+    ttk.Button(frame, text="Importa Configurazione",
+               command=lambda: import_config_gui(app)).pack(fill=tk.X, pady=2)
+    ttk.Button(frame, text="Esci",
+               command=lambda: shutdown_app(app)).pack(fill=tk.X,
+                                                       pady=(10, 0))
+
+    # React to link changes via netlink instead of polling; fall back to the
+    # old 5-second poll only if the notification socket cannot be opened.
+    app.netlink_socket = open_netlink_socket()
+    if app.netlink_socket is not None:
+        app.root.tk.createfilehandler(app.netlink_socket.fileno(),
+                                      tk.READABLE,
+                                      lambda fd, mask: on_link_event(app))
+    else:
+        def poll_status():
+            update_status(app)
+            app.root.after(5000, poll_status)
+        app.root.after(5000, poll_status)
+
+    app.root.after_idle(update_status, app)  # initial paint
+    if PREWARM_AUTH:
+        # Authorize and start the helper once the window is up, off-thread.
+        app.root.after(500, prewarm_privileges, app)
+    app.root.mainloop()
+
+
+if __name__ == "__main__":
+    create_main_window()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+
+# ==============================================================================
+# WireGuard VPN Privileged Helper Daemon
+# ==============================================================================
+#
+# Long-lived privileged companion of VPNClientGUI.py.  Launched once via:
+#
+#   pkexec ./vpn_helperd.py --socket /run/vpnclient.sock
+#
+# and then serves 'connect' / 'disconnect' / 'import' requests as
+# newline-delimited JSON messages over a Unix-domain socket.  This way the
+# PolicyKit authentication and the pkexec fork/exec are paid once per
+# session: every subsequent VPN operation is a single sendmsg/recvmsg
+# roundtrip to an already-running root process.
+#
+# Protocol (one request per connection):
+#   -> {"cmd": "connect", "args": ["my_home_vpn"]}\n
+#   <- {"ok": true, "output": "..."}\n
+#
+# The daemon exits on its own after IDLE_TIMEOUT seconds without requests.
+# ==============================================================================
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import socket
+import struct
+import subprocess
+import sys
+from pathlib import Path
+
+# Directory for WireGuard configurations (one .conf file per interface)
+WIREGUARD_CONFIG_DIR = "/etc/wireguard"
+
+# Companion script reused for the import/validation logic
+VPN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "VPN.sh")
+
+# Resolved once at startup; an absolute executable path also lets
+# subprocess skip the PATH search on every request
+WG_QUICK = shutil.which("wg-quick") or "/usr/bin/wg-quick"
+
+DEFAULT_SOCKET = "/run/vpnclient.sock"
+
+# Exit after this many seconds without requests
+IDLE_TIMEOUT = 600
+
+
+def allowed_peer_uid():
+    """Return the uid of the desktop user this daemon serves.
+
+    pkexec exports the invoking user's uid as PKEXEC_UID (sudo as
+    SUDO_UID); when launched as plain root with neither set, only root
+    itself may connect."""
+    for var in ("PKEXEC_UID", "SUDO_UID"):
+        value = os.environ.get(var)
+        if value is not None and value.isdigit():
+            return int(value)
+    return 0
+
+
+def peer_is_allowed(conn, peer_uid):
+    """Check the connecting process via SO_PEERCRED: only root and the
+    user the daemon was started for may issue commands.  Without this
+    check any local user could drive wg-quick — and, through 'import',
+    arbitrary PostUp lines — as root."""
+    try:
+        creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED,
+                                struct.calcsize("3i"))
+        _pid, uid, _gid = struct.unpack("3i", creds)
+    except OSError:
+        return False
+    return uid in (0, peer_uid)
+
+
+def configured_interfaces():
+    """Return the set of interface names with a .conf in /etc/wireguard."""
+    try:
+        return {p.stem for p in Path(WIREGUARD_CONFIG_DIR).glob("*.conf")}
+    except OSError:
+        return set()
+
+
+def _spawn_capture(argv):
+    """Minimal spawner for the fixed-shape wg-quick calls: os.posix_spawn
+    with one O_CLOEXEC pipe serving both stdout and stderr, skipping the
+    generic subprocess machinery (argument normalization, three pipe
+    pairs, signal handling).  Returns (exitcode, output_bytes)."""
+    r, w = os.pipe2(os.O_CLOEXEC)
+    try:
+        # dup2 onto fds 1/2 clears close-on-exec for the child's copies.
+        pid = os.posix_spawn(
+            argv[0], argv, os.environ,
+            file_actions=[(os.POSIX_SPAWN_DUP2, w, 1),
+                          (os.POSIX_SPAWN_DUP2, w, 2)])
+    except OSError:
+        os.close(r)
+        os.close(w)
+        raise
+    os.close(w)
+    chunks = []
+    while chunk := os.read(r, 4096):
+        chunks.append(chunk)
+    os.close(r)
+    _, status = os.waitpid(pid, 0)
+    return os.waitstatus_to_exitcode(status), b"".join(chunks)
+
+
+def run_verb(cmd, args):
+    """Execute one whitelisted verb and return a (success, output) tuple."""
+    if cmd == "list":
+        # Read-only: lets the GUI enumerate configurations when
+        # /etc/wireguard is not readable by the desktop user.
+        return True, "\n".join(sorted(configured_interfaces()))
+
+    if cmd in ("connect", "disconnect"):
+        if len(args) != 1:
+            return False, f"'{cmd}' richiede il nome dell'interfaccia."
+        iface = args[0]
+        # Only operate on interfaces that actually have a configuration:
+        # this daemon runs as root and must not up/down arbitrary links.
+        if iface not in configured_interfaces():
+            return False, f"Interfaccia sconosciuta: '{iface}'"
+        try:
+            code, out = _spawn_capture(
+                [WG_QUICK, "up" if cmd == "connect" else "down", iface])
+        except OSError as exc:
+            return False, str(exc)
+        return code == 0, out.decode(errors="replace").strip()
+
+    if cmd != "import":
+        return False, f"Comando non riconosciuto: '{cmd}'"
+    if len(args) != 2:
+        return False, "'import' richiede file sorgente e nome."
+    try:
+        # Rare path, left on subprocess.run; every descriptor this daemon
+        # holds is non-inheritable, so the child-side close-all fd walk
+        # can be skipped and CPython spawns via posix_spawn here too.
+        # VPN.sh re-validates the name and the configuration syntax.
+        result = subprocess.run([VPN_SCRIPT, "import", args[0], args[1]],
+                                capture_output=True, text=True,
+                                close_fds=False, restore_signals=False)
+    except OSError as exc:
+        return False, str(exc)
+    return result.returncode == 0, (result.stdout + result.stderr).strip()
+
+
+def handle_connection(conn):
+    """Read one JSON request line from the connection and reply to it."""
+    conn.settimeout(30)
+    buf = b""
+    try:
+        while not buf.endswith(b"\n"):
+            chunk = conn.recv(65536)
+            if not chunk:
+                break
+            buf += chunk
+        try:
+            request = json.loads(buf.decode())
+            ok, output = run_verb(request.get("cmd"),
+                                  list(request.get("args", [])))
+        except (ValueError, UnicodeDecodeError):
+            ok, output = False, "Richiesta malformata."
+        conn.sendall(json.dumps({"ok": ok, "output": output}).encode() + b"\n")
+    except OSError:
+        pass
+    finally:
+        conn.close()
+
+
+def serve(socket_path, peer_uid):
+    """Bind the Unix socket and serve requests until idle for too long.
+    Only peer_uid (and root) may connect."""
+    try:
+        os.unlink(socket_path)
+    except FileNotFoundError:
+        pass
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Python sockets are non-inheritable by default; make it explicit,
+    # since run_verb relies on it to spawn children with close_fds=False.
+    server.set_inheritable(False)
+    server.bind(socket_path)
+    # Reachable only by the desktop user the daemon was started for; the
+    # SO_PEERCRED check below enforces the same on every connection in
+    # case the socket inode permissions are ever loosened.
+    os.chmod(socket_path, 0o600)
+    os.chown(socket_path, peer_uid, -1)
+    server.listen(4)
+    server.settimeout(IDLE_TIMEOUT)
+
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break  # idle for too long: let a future pkexec restart us
+            if not peer_is_allowed(conn, peer_uid):
+                conn.close()
+                continue
+            handle_connection(conn)
+    finally:
+        server.close()
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Privileged WireGuard helper for VPNClientGUI.py")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET,
+                        help=f"Unix socket path (default: {DEFAULT_SOCKET})")
+    args = parser.parse_args()
+
+    if os.geteuid() != 0:
+        print("Questo helper deve essere eseguito come root (via pkexec).",
+              file=sys.stderr)
+        return 1
+
+    # Turn SIGTERM into a normal exit so serve()'s cleanup unlinks the
+    # socket instead of leaving a stale inode behind.
+    signal.signal(signal.SIGTERM, lambda _sig, _frm: sys.exit(0))
+
+    serve(args.socket, allowed_peer_uid())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())